@@ -16,6 +16,7 @@ from platform import system
 from pathlib import Path
 from typing import Union, List, Tuple
 from datetime import datetime
+from collections import defaultdict
 import re
 
 pd.set_option("display.width", 600)
@@ -150,19 +151,59 @@ def get_dicom_value(data: pydicom.Dataset, tags: List[List[tuple]], default=None
     return default
 
 
-def create_import_summary(import_summaries: list, config: dict):
+def new_import_summaries() -> defaultdict:
     """
-    Given a list of individual summaries of each subject/visit/scan, this function will bring all those givens
+    Convenience function for creating an empty collection of import summaries, stored column-wise
+    :return: a defaultdict mapping each summary parameter to the list of its values, one per converted directory
+    """
+    return defaultdict(list)
+
+
+def _n_summary_rows(import_summaries: dict) -> int:
+    return len(next(iter(import_summaries.values()), ()))
+
+
+def append_import_summary(import_summaries: defaultdict, summary: dict):
+    """
+    Appends the summary of a single subject/visit/scan to the column-wise import summaries. Parameters that were not
+    seen before are back-filled with None, and parameters absent from this summary receive None, so that all columns
+    always remain of equal length
+    :param import_summaries: the column-wise import summaries, as created by new_import_summaries
+    :param summary: the parameters of that subject-visit-scan
+    """
+    n_rows = _n_summary_rows(import_summaries)
+    for key in summary.keys() - import_summaries.keys():
+        import_summaries[key].extend([None] * n_rows)
+    for key, column in import_summaries.items():
+        column.append(summary.get(key))
+
+
+def extend_import_summaries(import_summaries: defaultdict, other_summaries: dict):
+    """
+    Extends the column-wise import summaries with those of another collection, such as those of another converter
+    :param import_summaries: the column-wise import summaries, as created by new_import_summaries
+    :param other_summaries: the column-wise import summaries to add to the former
+    """
+    n_rows, n_other_rows = _n_summary_rows(import_summaries), _n_summary_rows(other_summaries)
+    for key in other_summaries.keys() - import_summaries.keys():
+        import_summaries[key].extend([None] * n_rows)
+    for key, column in import_summaries.items():
+        column.extend(other_summaries.get(key, [None] * n_other_rows))
+
+
+def create_import_summary(import_summaries: dict, config: dict):
+    """
+    Given the individual summaries of each subject/visit/scan, this function will bring all those givens
     together into a single dataframe for easy viewing
-    :param import_summaries: a list of dicts, with each dict being the parameters of that subject-visit-scan
+    :param import_summaries: a dict of equal-length lists, with each list holding the values of a parameter and each
+    position in the lists being a subject-visit-scan
     :param config: the import configuration file generated by the GUI to help locate the analysis directory
     """
     analysis_dir = Path(config["RawDir"]).parent / "analysis"
-    try:
-        df = pd.concat([pd.Series(import_summary) for import_summary in import_summaries], axis=1, sort=True).T
-    except ValueError as concat_error:
-        print(concat_error)
+    if _n_summary_rows(import_summaries) == 0:
+        print("No import summaries were provided; an import dataframe will not be created")
         return
+    df = pd.DataFrame(import_summaries)
 
     df["dt"] = df["RepetitionTime"]
     appropriate_ordering = ['subject', 'visit', 'run', 'scan', 'dx', 'dy', 'dz', 'dt', 'nx', 'ny', 'nz', 'nt',
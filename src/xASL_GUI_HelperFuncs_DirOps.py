@@ -1,10 +1,21 @@
 from pathlib import Path
-from json import load, loads, dump, JSONDecodeError
-from typing import Union, List, Any
+from json import loads, dump, JSONDecodeError
+from typing import Union, List, Any, Callable, Iterator
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import translate
 import pandas as pd
-from numpy import isnan
-from shutil import copyfile
+from shutil import copyfile, SameFileError
 import logging
+import errno
+import os
+import re
+
+# orjson is an optional accelerator for the sidecar parsing in this module; fall back to the stdlib if absent
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 ########################################################################################################################
@@ -15,6 +26,64 @@ import logging
 #       - alter_sidecars ; using either a csv dataframe or a list of subjects + key + value ; alter the json sidecars
 #       in a given study
 ########################################################################################################################
+# The sidecar glob patterns of each scan type, precompiled once. fnmatch is case-insensitive on Windows; keep that here
+_SCAN_TRANSLATOR = {"asl": "*ASL4D*.json", "t1": "*T1*.json", "m0": "*M0*.json"}
+_SCAN_REGEX = {scan: re.compile(translate(pattern), re.IGNORECASE if os.name == "nt" else 0)
+               for scan, pattern in _SCAN_TRANSLATOR.items()}
+_GLOB_CHARS = re.compile(r"[*?[]")  # Subject names containing any of these are treated as glob patterns
+
+# The (lowercase) strings that interpret_value will convert to booleans
+_TRUE_STRINGS = frozenset({"true", "t", "yes", "y"})
+_FALSE_STRINGS = frozenset({"false", "f", "no", "n"})
+
+# The (lowercase) action names that mean a sidecar key should be removed rather than altered
+_REMOVE_ACTIONS = frozenset({"remove", "purge", "delete"})
+
+
+def _scandir_recursive(root: Union[Path, str], match_fn: Callable[[str], Any],
+                       match_dirs: bool = False) -> Iterator[str]:
+    """
+    Walks a directory tree breadth-first with os.scandir, yielding the paths of entries whose basename satisfies a
+    predicate. Entry types are read from the cached DirEntry information, so no additional stat calls are made per
+    entry. Symlinked directories are not descended into, matching the behavior of Path.rglob.
+
+    :param root: the directory from which to start the walk
+    :param match_fn: a callable accepting a basename and returning a truthy value if the entry should be yielded
+    :param match_dirs: whether the entries to yield are directories (True) or files (False; default)
+    :return: a generator of matching filepaths as strings
+    """
+    to_visit = deque([os.fspath(root)])
+    while to_visit:
+        dirpath = to_visit.popleft()
+        try:
+            with os.scandir(dirpath) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        if is_dir:
+                            to_visit.append(entry.path)
+                        is_match_type = is_dir if match_dirs else entry.is_file()
+                    except OSError:
+                        continue
+                    if is_match_type and match_fn(entry.name):
+                        yield entry.path
+        except (PermissionError, FileNotFoundError, NotADirectoryError):
+            continue
+
+
+def _json_loads(data: Union[str, bytes]):
+    """
+    Parses JSON with orjson where available. orjson rejects the NaN/Infinity literals that the stdlib reads and writes
+    by default, so such documents are handed over to the stdlib parser instead
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return loads(data)
+
+
 def robust_read_csv(df_path: Union[Path, str], **kwargs):
     """
     Reads in a dataframe, accounting for common file extensions
@@ -26,17 +95,15 @@ def robust_read_csv(df_path: Union[Path, str], **kwargs):
     if isinstance(df_path, str):
         df_path = Path(df_path)
 
-    if df_path.suffix == ".csv":
-        df = pd.read_csv(df_path, sep=",", **kwargs)
-    elif df_path.suffix == ".tsv":
-        df = pd.read_csv(df_path, sep="\t", **kwargs)
+    if df_path.suffix in {".csv", ".tsv"}:
+        sep = "," if df_path.suffix == ".csv" else "\t"
+        df = pd.read_csv(df_path, sep=sep, **kwargs)
     elif df_path.suffix == ".xlsx":
         df = pd.read_excel(df_path, **kwargs)
     else:
         return None
-    for column in df.columns:
-        if column.startswith("Unnamed:"):
-            df.drop(column, axis=1, inplace=True)
+    # Drop pandas' placeholder columns (i.e. a saved index) in a single selection
+    df = df.drop(columns=df.columns[df.columns.astype(str).str.startswith("Unnamed:")])
     return df
 
 
@@ -46,70 +113,83 @@ def interpret_value(value: Any):
             if value == "NONE":  # This will be the only way to actually force a None value (null) to be assigned
                 return None
         return value
-    if value == "":  # Case: empty string; just return it
+    first_char = value[:1]
+    if first_char == "":  # Case: empty string; just return it
         return ""
-    elif value.isdigit():  # Case: something numerical; return the appropriate number type
-        try:
-            return int(value)
-        except ValueError:
-            return float(value)
-    elif value.startswith("[") and value.endswith("]"):
+    elif first_char == "[" and value.endswith("]"):
         splitter = ", " if ", " in value else ","
         to_return = [interpret_value(sub_val) for sub_val in value.strip("[]").split(splitter)]  # Case: list;
         if len(to_return) == 1:
             return to_return[0]
         else:
             return to_return
-    elif value.startswith("{") and value.endswith("}"):
+    elif first_char == "{" and value.endswith("}"):
         value = value.replace('“', '"').replace('”', '"')
         try:
-            to_return = loads(value)
+            to_return = _json_loads(value)
         except JSONDecodeError:
             to_return = None
         return to_return
-    elif value.lower() in ["true", "t", "yes", "y"]:  # Case: it's a positive boolean
+    elif value.isdigit():  # Case: something numerical; return the appropriate number type
+        try:
+            return int(value)
+        except ValueError:
+            return float(value)
+
+    lowered = value.lower()
+    if lowered in _TRUE_STRINGS:  # Case: it's a positive boolean
         return True
-    elif value.lower() in ["false", "f", "no", "n"]:  # Case: it's a negative boolean
+    elif lowered in _FALSE_STRINGS:  # Case: it's a negative boolean
         return False
     else:
         return value
 
 
-def alter_json_sidecar(json_path: Union[Path, str], action: str, key: str, value: Any = None):
+def alter_json_sidecar(json_path: Union[Path, str], action: str, key: str, value: Any = None,
+                       is_remove: bool = None, logger: logging.Logger = logging.getLogger()):
     """
     Changes a key within the json sidecars to either have a specific key removed altogether or its value changed
     :param json_path: path to the json sidecar file
     :param action: a string denoting the action to take ("remove" to remove the key; "alter" to alter the value)
     :param key: which key to remove or change
     :param value: if altering a key, what new value it should take on
+    :param is_remove: the already-interpreted action, for callers altering many sidecars; derived from action if None
+    :param logger: the logging object that records processing errors
     """
-    json_path = Path(json_path)
-    if any([not json_path.exists(), key is None]):
+    if is_remove is None:
+        is_remove = action.lower() in _REMOVE_ACTIONS
+    if key is None:
         return False, f"{str(json_path)} did not exist"
     try:
-        with open(json_path, "r") as sidecar_reader:
-            sidecar_data = load(sidecar_reader)
-            if action.lower() in {"remove", "purge", "delete"}:
+        # Read, alter, and write back through a single file handle; a missing file surfaces on open rather than through
+        # a separate existence check beforehand
+        with open(json_path, "r+", encoding="utf-8") as sidecar_file:
+            sidecar_data = _json_loads(sidecar_file.read())
+            if is_remove:
                 del sidecar_data[key]
             else:
                 sidecar_data[key] = value
+            sidecar_file.seek(0)
+            # Always written by the stdlib so that the file format (and NaN support) never depends on orjson
+            dump(sidecar_data, sidecar_file, indent=3)
+            sidecar_file.truncate()
+    except FileNotFoundError:
+        return False, f"{str(json_path)} did not exist"
     except KeyError as key_err:
         msg = f"Encountered a KeyError with key {key}:\t{key_err}\n" \
               f"Was the user attempting to remove a non-existent key?"
-        print(msg)
+        logger.warning(msg)
         return False, msg
     except JSONDecodeError as json_err:
         msg = f"Encountered a JSONDecodeError with with file {json_path}:\n\t{json_err}"
-        print(msg)
+        logger.warning(msg)
         return False, msg
-    with open(json_path, "w") as sidecar_writer:
-        dump(sidecar_data, sidecar_writer, indent=3)
     return True, "Success"
 
 
 def alter_sidecars(root_dir: Union[str, Path], subjects: Union[List[str], str, Path],
                    which_scan: str, action: str, key: str = None, value: Any = None,
-                   logger: logging.Logger = logging.getLogger()):
+                   logger: logging.Logger = logging.getLogger(), deep_search: bool = True):
     """
     Changes the json sidecars of specified subjects in a study directory
 
@@ -121,6 +201,8 @@ def alter_sidecars(root_dir: Union[str, Path], subjects: Union[List[str], str, P
     :param key: the name of the sidecar key to change
     :param value: the new value the sidecar should take on, if any
     :param logger: the logging object that records processing errors
+    :param deep_search: whether subjects that are not immediate children of root_dir should be searched for further
+    down the tree (default True). If False, only the immediate children of root_dir are considered.
     """
     # Defensive Programming
     root_dir = Path(root_dir).resolve()
@@ -128,12 +210,14 @@ def alter_sidecars(root_dir: Union[str, Path], subjects: Union[List[str], str, P
     if not root_dir.exists():
         logger.error(f"The indicated directory: {str(root_dir)} does not exist!")
         return False
-    if which_scan.lower() not in ["asl", "t1", "m0"]:
+    scan_key = which_scan.lower()
+    if scan_key not in _SCAN_REGEX:
         logger.error(f"An unknown scan type was provided: {which_scan}. "
                      f"Could not process the sidecars of this scan type")
         return False
 
-    scan_translator = {"asl": "*ASL4D*.json", "t1": "*T1*.json", "m0": "*M0*.json"}
+    name_regex = _SCAN_REGEX[scan_key]
+    is_remove = action.lower() in _REMOVE_ACTIONS
 
     # Get a dict whose keys are subject names and whose values are a dict of sidecar key and new value
     if isinstance(subjects, (str, Path)):
@@ -142,64 +226,119 @@ def alter_sidecars(root_dir: Union[str, Path], subjects: Union[List[str], str, P
             logger.error(f"The read-in dataframe did not contain the essential SUBJECT column")
             return False
         df.set_index("SUBJECT", inplace=True)
-        iter_dict: dict = df.T.to_dict()
+        # Build the row dicts straight from the tuples rather than transposing the whole dataframe first
+        columns = df.columns.tolist()
+        iter_dict: dict = {subject: dict(zip(columns, row_values))
+                           for subject, *row_values in df.itertuples(index=True, name=None)}
     elif isinstance(subjects, list):
         iter_dict: dict = {subject: {key: value} for subject in subjects}
     else:
         return False
 
+    # In the typical layout subjects are immediate children of the root; index those in a single pass
+    with os.scandir(root_dir) as entries:
+        subject_index = {entry.name: entry.path for entry in entries if entry.is_dir(follow_symlinks=False)}
+
     n_subjects_found = 0
-    results = []  # A list of tuples of (successful, msg)
+    jobs = {}  # Keys are sidecar filepaths; values are lists of (key, value) alterations to apply to that sidecar
     skipped = []
     for subject, key_val_dict in iter_dict.items():
-        # Get the subject
-        try:
-            subject_path = next(root_dir.rglob(subject))
-            if not subject_path.is_dir():
-                continue
-            print(subject_path)
-            n_subjects_found += 1
-        except StopIteration:
+        # Get the subject; ids read in from a spreadsheet may not be strings (i.e. purely numerical subject names)
+        subject = str(subject)
+        subject_path = subject_index.get(subject)
+        is_literal = _GLOB_CHARS.search(subject) is None
+        if subject_path is None and is_literal:
+            # Literal names that weren't indexed (i.e. "site/subject") can still be resolved without any scanning
+            candidate = os.path.join(root_dir, subject)
+            if os.path.isdir(candidate):
+                subject_path = candidate
+        if subject_path is None and deep_search:
+            match_fn = (lambda name: name == subject) if is_literal else re.compile(translate(subject)).match
+            subject_path = next(_scandir_recursive(root_dir, match_fn, match_dirs=True), None)
+        if subject_path is None:
             skipped.append(subject)
             continue
+        logger.debug(f"Found subject: {subject_path}")
+        n_subjects_found += 1
 
-        # Retrieve the jsons of interest, interpret the value, then alter the sidecars
+        # Retrieve the jsons of interest once per subject, then interpret each value and queue up the alterations
+        json_paths = list(_scandir_recursive(subject_path, name_regex.match))
+        if len(json_paths) == 0:
+            continue
         for k, v in key_val_dict.items():
-            json_paths = tuple(subject_path.rglob(scan_translator[which_scan.lower()]))
-            if len(json_paths) == 0:
-                continue
-
             interpreted_value = interpret_value(v)
-            try:
-                is_nan = isnan(interpreted_value)
-                if len(is_nan) > 1:
-                    is_nan = any(is_nan)
-            except TypeError:  # TypeError occurs if the interpreted_value is not numeric
-                is_nan = False
+            # NaN is the only value that is not equal to itself; this avoids both numpy and exception handling
+            is_nan = (isinstance(interpreted_value, float) and interpreted_value != interpreted_value) or \
+                     (isinstance(interpreted_value, list) and
+                      any(isinstance(sub_val, float) and sub_val != sub_val for sub_val in interpreted_value))
 
             # At the current time, NaNs will be skipped
             if is_nan:
                 continue
 
             for json_file in json_paths:
-                succes, msg = alter_json_sidecar(json_path=json_file, action=action, key=k, value=interpreted_value)
-                results.append((str(json_file), succes, msg))
+                jobs.setdefault(json_file, []).append((k, interpreted_value))
+
+    # Each sidecar is independent of the others and the work is I/O-bound, so alter them concurrently. All alterations
+    # to the same sidecar are applied in order by a single thread so that they cannot overwrite one another
+    def alter_one_sidecar(job):
+        json_file, alterations = job
+        return [(json_file, *alter_json_sidecar(json_path=json_file, action=action, key=alter_key, value=alter_value,
+                                                  is_remove=is_remove, logger=logger))
+                for alter_key, alter_value in alterations]
 
     if n_subjects_found == 0:
         logger.error(f"Could not locate any of the specified subjects in {str(root_dir)}")
         return False
 
-    # Parse the results variable into a neat-looking string
-    results_str = "\n".join([f"File:\t{file}\n\tSuccessful Operation?: {success}\n\tExit Message: {msg}"
-                             for file, success, msg in results])
-    logger.info(results_str)
-    _, statuses, _ = zip(*results)
+    # Log the outcome of each alteration as it comes in, keeping only a tally
+    n_successes, n_failures = 0, 0
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+        for sidecar_results in executor.map(alter_one_sidecar, jobs.items()):
+            for file, success, msg in sidecar_results:
+                logger.debug(f"File:\t{file}\n\tSuccessful Operation?: {success}\n\tExit Message: {msg}")
+                if success:
+                    n_successes += 1
+                else:
+                    n_failures += 1
+    logger.info(f"Sidecar operations completed: {n_successes} succeeded, {n_failures} failed")
 
     # Return a status code depending on whether everything went smoothly or not
-    if all(statuses):
-        return True
-    else:
-        return False
+    return n_failures == 0
+
+
+def fast_copyfile(src: Union[Path, str], dst: Union[Path, str]) -> None:
+    """
+    Copies the contents of a file entirely in-kernel via os.copy_file_range where available (Linux, Python 3.8+). Falls
+    back to shutil's copyfile on other platforms, or if the filesystem(s) involved do not support the call.
+
+    :param src: the file to copy from
+    :param dst: the file to copy to; created or truncated as with shutil's copyfile
+    :raises SameFileError: if src and dst are the same file (including via hard links or symlinks), as shutil's
+    copyfile does; dst is opened with O_TRUNC, which would otherwise empty the source before it could be read
+    """
+    if not hasattr(os, "copy_file_range"):
+        copyfile(src, dst)
+        return
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise SameFileError(f"{src!r} and {dst!r} are the same file")
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        os.posix_fadvise(src_fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            while os.copy_file_range(src_fd, dst_fd, 1 << 30) > 0:
+                pass
+            return
+        except OSError as copy_err:
+            if copy_err.errno not in {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EPERM}:
+                raise
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    # Only reached if copy_file_range is unsupported for these files
+    copyfile(src, dst)
 
 
 def merge_directories(roots: List[Union[Path, str]],
@@ -215,57 +354,61 @@ def merge_directories(roots: List[Union[Path, str]],
     :param overwrite: whether to overwrite existent paths downstream from merge_root; default is False
     """
 
-    def make_symlinks(parentpath: Path, current_root: str, target_root: str, overwrite_links: bool = overwrite):
+    def collect_links(current_root: str, target_root: str, links: dict, overwrite_links: bool = overwrite):
         """
-        Walks recursively down a filepath, creating symlinks as needed based on a reference "other" root directory
+        Walks down a root directory, recreating its directories under the target root and registering each of its files
+        in links (destination -> source). Later roots take precedence over earlier ones only when overwriting
         """
-        for childpath in parentpath.iterdir():
-            symlink_path = Path(str(childpath).replace(current_root, target_root))
-            if all([childpath.exists(), childpath.is_dir()]):
-                symlink_path.mkdir(parents=True, exist_ok=True)
-                make_symlinks(childpath, current_root, target_root, overwrite_links)
-            elif all([childpath.exists(), childpath.is_file(), overwrite_links]):
-                if symlink_path.exists():
-                    symlink_path.unlink(missing_ok=True)
-                symlink_path.symlink_to(childpath)
-            elif all([childpath.exists(), childpath.is_file(), not overwrite_links]):
-                if not symlink_path.exists():
-                    symlink_path.symlink_to(childpath)
-            else:
-                continue
+        for dirpath, _, filenames in os.walk(current_root, followlinks=True):
+            target_dir = os.path.normpath(os.path.join(target_root, os.path.relpath(dirpath, current_root)))
+            os.makedirs(target_dir, exist_ok=True)
+            for filename in filenames:
+                src_path, dst_path = os.path.join(dirpath, filename), os.path.join(target_dir, filename)
+                # os.walk lists broken symlinks as files; skip them rather than linking to or copying from nothing
+                if not os.path.exists(src_path):
+                    continue
+                if overwrite_links:
+                    links[dst_path] = src_path
+                else:
+                    links.setdefault(dst_path, src_path)
 
-    def make_reallinks(parentpath: Path, current_root: str, target_root: str, overwrite_links: bool = overwrite):
+    def make_link(dst_path: str, src_path: str, overwrite_links: bool = overwrite):
         """
-        Walks recursively down a filepath, copying files & dirs as needed based on a reference "other" root directory
+        Symlinks or copies a single file over to its destination
         """
-        for childpath in parentpath.iterdir():
-            reallink_path = Path(str(childpath).replace(current_root, target_root))
-            if all([childpath.exists(), childpath.is_dir()]):
-                reallink_path.mkdir(parents=True, exist_ok=True)
-                make_reallinks(childpath, current_root, target_root, overwrite_links)
-            elif all([childpath.exists(), childpath.is_file(), overwrite_links]):
-                if reallink_path.exists():
-                    reallink_path.unlink(missing_ok=True)
-                copyfile(src=childpath, dst=reallink_path)
-            elif all([childpath.exists(), childpath.is_file(), not overwrite_links]):
-                if not reallink_path.exists():
-                    copyfile(src=childpath, dst=reallink_path)
-            else:
-                continue
+        if symbolic:
+            # Most destinations do not exist yet, so attempt the link first and only deal with a clash after
+            try:
+                os.symlink(src_path, dst_path)
+            except FileExistsError:
+                if not overwrite_links:
+                    return
+                os.unlink(dst_path)
+                os.symlink(src_path, dst_path)
+        else:
+            # copyfile writes over existing files (and through symlinks), so clear or skip the destination first
+            if overwrite_links:
+                try:
+                    os.unlink(dst_path)
+                except FileNotFoundError:
+                    pass
+            elif os.path.lexists(dst_path):
+                return
+            fast_copyfile(src=src_path, dst=dst_path)
 
-    # Account for typing
-    if isinstance(merge_root, str):
-        merge_root = Path(merge_root)
-    if not merge_root.exists():
-        merge_root.mkdir(parents=True)
+    # Account for typing; everything downstream works on plain strings, which os.walk/os.symlink/etc. accept directly
+    roots = [os.fspath(root) for root in roots]
+    merge_root = os.fspath(merge_root)
+    os.makedirs(merge_root, exist_ok=True)
 
-    # Iterate over the analysis directories
+    # Iterate over the analysis directories, creating the directory structure first such that the files can then be
+    # linked in parallel without any race on their parent directories; each destination is only handled once
+    to_link = {}
     for root in roots:
-        if isinstance(root, str):
-            root = Path(root)
-        if symbolic:
-            make_symlinks(parentpath=root, current_root=str(root),
-                          target_root=str(merge_root), overwrite_links=symbolic)
-        else:
-            make_reallinks(parentpath=root, current_root=str(root),
-                           target_root=str(merge_root), overwrite_links=symbolic)
+        collect_links(current_root=root, target_root=merge_root, links=to_link, overwrite_links=overwrite)
+
+    n_workers = 8 if symbolic else min(32, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        # Consume the results so that any exception raised by a worker propagates to the caller
+        for _ in executor.map(make_link, to_link.keys(), to_link.values()):
+            pass
@@ -8,6 +8,7 @@ from pathlib import Path
 from os import sep
 from platform import system
 from more_itertools import peekable, interleave_longest
+from functools import lru_cache
 import re
 
 
@@ -94,6 +95,26 @@ def set_formlay_options(formlay: QFormLayout,
         formlay.setHorizontalSpacing(horizontal_spacing)
 
 
+@lru_cache(maxsize=64)
+def cached_icon(icon_path: str, width: int = None, height: int = None) -> QIcon:
+    """
+    Convenience function for retrieving a QIcon such that each image file is only read from disk once per session
+
+    Parameters
+        • icon_path: the filepath to the image, as a string
+        • width: the width, in pixels, at which the icon should be pre-rendered, if any
+        • height: the height, in pixels, at which the icon should be pre-rendered, if any
+
+    Returns
+        • The shared QIcon instance for that filepath and size
+    """
+    icon = QIcon(icon_path)
+    if width is not None and height is not None:
+        # Rendering once here populates the icon's own pixmap cache for the size the widgets will request
+        icon.pixmap(QSize(width, height))
+    return icon
+
+
 def set_widget_icon(widget, config: dict, icon_name: str, size: tuple = None) -> None:
     """
     Convenience function for setting a widget to contain an icon of a particular size
@@ -108,9 +129,11 @@ def set_widget_icon(widget, config: dict, icon_name: str, size: tuple = None) ->
         • None
     """
     icon_path = Path(config["ProjectDir"]) / "media" / icon_name
-    widget.setIcon(QIcon(str(icon_path)))
     if size is not None:
+        widget.setIcon(cached_icon(str(icon_path), *size))
         widget.setIconSize(QSize(*size))
+    else:
+        widget.setIcon(cached_icon(str(icon_path)))
 
 
 def connect_widget_to_signal(widget, target_signal: callable) -> None:
@@ -2,95 +2,315 @@ from PySide2.QtWidgets import *
 from PySide2.QtGui import *
 from PySide2.QtCore import *
 from src.xASL_GUI_HelperClasses import DandD_FileExplorer2LineEdit, xASL_PushButton
-from src.xASL_GUI_HelperFuncs_WidgetFuncs import set_formlay_options, robust_qmsg
+from src.xASL_GUI_HelperFuncs_WidgetFuncs import set_formlay_options, robust_qmsg, cached_icon
 from src.xASL_GUI_Dehybridizer import xASL_GUI_Dehybridizer
 from src.xASL_GUI_DCM2NIFTI import *
 from tdda import rexpy
 from pprint import pprint
 from collections import OrderedDict
-from more_itertools import divide, flatten, collapse
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from multiprocessing import Manager
+from multiprocessing.managers import SyncManager
+from itertools import chain
 import json
+import shutil
 from os import chdir
+import os
+import sys
 from platform import system
 from pathlib import Path
-from typing import List, Iterator, Set
+from typing import List, Iterator, Iterable, Set, Optional, Tuple
+from functools import lru_cache
 import logging
 from datetime import datetime
+import re
+import random
+import time
+import queue
+
+# orjson is an optional accelerator for JSON parsing; fall back to the stdlib if absent
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+LOG_SEPARATOR = "\n" + "#" * 50 + "\n"  # Written between the logs of each converter in the combined import log
+REGEX_SAMPLE_SIZE = 2048  # The maximum number of basenames that regex inference is performed upon
+_SYSTEM = system()  # Names the platform-specific DCM2NIIX directory
+IS_WIN = sys.platform == "win32"
+IS_MAC = sys.platform == "darwin"
+
+# The import byproducts that BIDS validators should skip over
+BIDSIGNORE = b"Import_Log_*.log\nImport_Failed*.txt\nImport_Dataframe_*.tsv\n"
+
+# The dataset description written for BIDS imports, for the user to complete at a later point in time
+DATASET_DESCRIPTION_TEMPLATE = {
+    "BIDSVersion": "0.1.0",
+    "License": "CC0",
+    "Name": "A multi-subject, multi-modal human neuroimaging dataset",
+    "Authors": [],
+    "Acknowledgements": "",
+    "HowToAcknowledge": "This data was obtained from [owner]. "
+                        "Its accession number is [id number]'",
+    "ReferencesAndLinks": ["https://www.ncbi.nlm.nih.gov/pubmed/25977808",
+                           "https://openfmri.org/dataset/ds000117/"],
+    "Funding": ["UK Medical Research Council (MC_A060_5PR10)"]
+}
+
+
+@lru_cache(maxsize=8192)
+def _scan_subdirectories(dirpath: str, mtime_ns: int) -> Tuple[str, ...]:
+    """
+    Lists the immediate subdirectories of a directory, using the entry types provided by os.scandir. The modification
+    time is part of the cache key so that a directory whose children have changed since it was last listed is scanned
+    afresh
+    """
+    try:
+        with os.scandir(dirpath) as entries:
+            return tuple(entry.path for entry in entries if entry.is_dir())
+    except OSError:
+        return ()
+
+
+def _list_subdirectories(dirpath: str) -> Tuple[str, ...]:
+    """
+    Lists the immediate subdirectories of a directory; re-listing an unchanged directory only costs a single stat
+    :param dirpath: the directory to list
+    :return: the paths of the subdirectories; empty if the directory could not be listed
+    """
+    try:
+        mtime_ns = os.stat(dirpath).st_mtime_ns
+    except OSError:
+        return ()
+    return _scan_subdirectories(dirpath, mtime_ns)
+
+
+def scan_nth_level_dirs(root_dir: str, level: int, executor: Optional[ThreadPoolExecutor] = None) -> List[str]:
+    """
+    Retrieves the directories found at a particular depth below a root directory, descending one level at a time
+    :param root_dir: the directory to descend from
+    :param level: the depth, in python index terms, of the directories to retrieve (0 being the immediate children)
+    :param executor: if provided, the directories of each level are listed concurrently using this thread pool
+    :return: the paths of the directories found at the indicated depth
+    """
+    current_dirs = [root_dir]
+    for _ in range(level + 1):
+        mapper = executor.map if executor is not None else map
+        current_dirs = list(chain.from_iterable(mapper(_list_subdirectories, current_dirs)))
+    return current_dirs
+
+
+def divide(n: int, seq: list) -> List[list]:
+    """
+    Divides a sequence into n contiguous chunks whose lengths differ by at most one, the first chunks being the longer
+    :param n: the number of chunks to create
+    :param seq: the sequence to divide
+    :return: the list of chunks
+    """
+    q, r = divmod(len(seq), n)
+    return [seq[i * q + min(i, r):(i + 1) * q + min(i + 1, r)] for i in range(n)]
+
+
+def _ordered_unique(seq: Iterable[str]) -> List[str]:
+    """
+    Removes the duplicates of a sequence in a single pass, preserving the order in which items were first seen
+    :param seq: the sequence to de-duplicate
+    :return: the unique items of the sequence
+    """
+    seen = set()
+    add = seen.add
+    return [item for item in seq if not (item in seen or add(item))]
+
+
+@lru_cache(maxsize=64)
+def infer_regex(unique_strings: Tuple[str, ...]) -> str:
+    """
+    Self-explanatory: deduces a regex string to match a provided set of strings. Results are cached, as the same
+    basenames tend to be re-inferred whenever a label is dropped in again
+    :param unique_strings: the sorted tuple of unique strings to be matched
+    :return: The inferred regex string matching the all the items in the set of strings
+    """
+    def extract(strings: List[str]) -> str:
+        extractor = rexpy.Extractor(strings)
+        extractor.extract()
+        return extractor.results.rex[0]
+
+    # For large populations, infer from a reproducible sample and only fall back to the full population if the
+    # sample's regex fails to match every string
+    if len(unique_strings) > REGEX_SAMPLE_SIZE:
+        regex = extract(sorted(random.Random(0).sample(unique_strings, REGEX_SAMPLE_SIZE)))
+        fullmatch = re.compile(regex).fullmatch
+        if all(fullmatch(string) for string in unique_strings):
+            return regex
+    return extract(list(unique_strings))
+
+
+def _compile(regex: Optional[str]) -> Optional[re.Pattern]:
+    """
+    Compiles an inferred regex string (rexpy anchors its output with ^...$, which re accepts as-is)
+    :param regex: the regex string to compile; None is passed through
+    :return: the compiled pattern, or None if no regex was provided
+    """
+    return re.compile(regex) if regex is not None else None
+
+
+def write_json(json_path: Path, data: dict):
+    """
+    Writes a dict to a JSON file atomically: the contents are first written to a temporary file alongside the
+    destination, which then replaces it, such that an interrupted write never leaves a truncated file behind
+    :param json_path: the filepath of the JSON file to write
+    :param data: the dict to serialize
+    """
+    # Both backends produce the same 2-space indented, raw UTF-8 layout so the files never depend on orjson's presence
+    if orjson is not None:
+        contents = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        contents = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    tmp_path = json_path.with_name(json_path.name + ".tmp")
+    tmp_path.write_bytes(contents)
+    os.replace(tmp_path, json_path)
+
+
+class Importer_DirScannerSignals(QObject):
+    """
+    Class for handling the signals sent by a directory scanner
+    """
+    signal_send_dirs = Signal(str, str, int, list)  # Signal sent with the rawdir, dir_type, level and found directories
+
+
+class Importer_DirScanner(QRunnable):
+    """
+    Worker thread for retrieving the directories at a particular level of the raw directory without blocking the GUI
+    """
+
+    def __init__(self, rawdir: str, dir_type: str, level: int, executor: ThreadPoolExecutor = None):
+        super().__init__()
+        self.signals = Importer_DirScannerSignals()
+        self.rawdir = rawdir
+        self.dir_type = dir_type
+        self.level = level
+        self.executor = executor
+
+    def run(self):
+        directories = scan_nth_level_dirs(root_dir=self.rawdir, level=self.level, executor=self.executor)
+        self.signals.signal_send_dirs.emit(self.rawdir, self.dir_type, self.level, directories)
 
 
 class Importer_WorkerSignals(QObject):
     """
     Class for handling the signals sent by an ExploreASL worker
     """
-    signal_send_summaries = Signal(list)  # Signal sent by worker to process the summaries of imported files
+    signal_send_summaries = Signal(dict)  # Signal sent by worker to process the summaries of imported files
     signal_send_errors = Signal(list)  # Signal sent by worker to indicate the file where something has failed
-    signal_update_progressbar = Signal()  # Signal sent by worker to indicate a completed directory
+    signal_update_progressbar = Signal(int)  # Signal sent by worker with the number of newly-completed directories
     signal_confirm_terminate = Signal()  # Signal sent by worker to indicate a termination had occurred
 
 
+PROGRESS_INTERVAL = 0.1  # Minimum number of seconds between progressbar updates sent by a conversion process
+
+
+def run_import_group(dcm_dirs: List[Path], config: dict, use_legacy_mode: bool, name: str, progress_queue,
+                     stop_event) -> Tuple[list, list, bool]:
+    """
+    Converts a group of DICOM directories into NIFTI format. This is run in a separate process on behalf of an
+    Importer_Worker, such that the CPU-bound conversions of several groups are not serialized by the GIL. Only paths
+    and plain data cross the process boundary.
+    :param dcm_dirs: the DICOM directories to convert
+    :param config: the import parameters
+    :param use_legacy_mode: whether to use legacy mode or not
+    :param name: the name of the converter, which also determines the name of its temporary log file
+    :param progress_queue: a manager queue receiving the number of directories completed since the last update
+    :param stop_event: a manager event which, once set, stops the conversion at the next available DICOM dir
+    :return: a tuple of the import summaries, the descriptions of failed runs, and whether a termination occurred
+    """
+    logger = logging.Logger(name=name, level=logging.DEBUG)
+    converter = DCM2NIFTI_Converter(config=config, name=name, logger=logger, b_legacy=use_legacy_mode)
+    import_summaries, failed_runs = new_import_summaries(), []
+
+    # Progress is reported at most every PROGRESS_INTERVAL seconds so that large imports do not flood the GUI
+    n_since_emit, last_emit = 0, time.monotonic()
+    for dicom_dir in dcm_dirs:
+        if stop_event.is_set():
+            break
+        success, job_description = converter.process_dcm_dir(dcm_dir=dicom_dir)
+        if success:
+            append_import_summary(import_summaries, converter.summary_data)
+        else:
+            failed_runs.append(job_description)
+        n_since_emit += 1
+        if time.monotonic() - last_emit >= PROGRESS_INTERVAL:
+            progress_queue.put(n_since_emit)
+            n_since_emit, last_emit = 0, time.monotonic()
+    if n_since_emit > 0:
+        progress_queue.put(n_since_emit)
+
+    converter.logger.removeHandler(converter.handler)
+    return import_summaries, failed_runs, stop_event.is_set()
+
+
 # noinspection PyUnresolvedReferences
 class Importer_Worker(QRunnable):
     """
-    Worker thread for running the import for a particular group.
+    Worker thread for running the import for a particular group. The conversion itself takes place in a process of the
+    provided pool; this thread relays its progress and results back to the GUI.
     """
 
-    def __init__(self, dcm_dirs: Iterator[Path], config: dict, use_legacy_mode: bool, name: str = None):
-        self.dcm_dirs: Iterator[Path] = dcm_dirs
+    def __init__(self, dcm_dirs: Iterator[Path], config: dict, use_legacy_mode: bool, name: str = None,
+                 executor: ProcessPoolExecutor = None, manager: SyncManager = None, stop_event=None):
+        self.dcm_dirs: List[Path] = list(dcm_dirs)
         self.import_config: dict = config
         self.use_legacy_mode: bool = use_legacy_mode
         super().__init__()
         self.signals = Importer_WorkerSignals()
-        self.import_summaries = []
+        self.import_summaries = new_import_summaries()
         self.failed_runs = []
         self.name = name
-        self._terminated = False
-
-        logger = logging.Logger(name=name, level=logging.DEBUG)
-        self.converter = DCM2NIFTI_Converter(config=config, name=name, logger=logger, b_legacy=use_legacy_mode)
-        print("Initialized Worker with args:\n")
-        pprint(self.import_config)
+        self.executor = executor
+        self.progress_queue = manager.Queue()
+        self.stop_event = stop_event  # A manager event shared by all workers of the run; set to terminate the import
 
     def run(self):
-        for dicom_dir in self.dcm_dirs:
-            if not self._terminated:
-                success, job_description = self.converter.process_dcm_dir(dcm_dir=dicom_dir)
-                if success:
-                    self.import_summaries.append(self.converter.summary_data.copy())
-                    self.signals.signal_update_progressbar.emit()
-                else:
-                    self.failed_runs.append(job_description)
-                    self.signals.signal_update_progressbar.emit()
+        future = self.executor.submit(run_import_group, self.dcm_dirs, self.import_config, self.use_legacy_mode,
+                                      self.name, self.progress_queue, self.stop_event)
 
-        # Cleanup handlers and such
-        if not self._terminated:
-            self.converter.logger.removeHandler(self.converter.handler)
+        # Relay the progress of the conversion process until it finishes, then collect any final updates
+        while not future.done():
+            try:
+                self.signals.signal_update_progressbar.emit(self.progress_queue.get(timeout=0.05))
+            except queue.Empty:
+                continue
+        while True:
+            try:
+                self.signals.signal_update_progressbar.emit(self.progress_queue.get_nowait())
+            except queue.Empty:
+                break
 
+        try:
+            self.import_summaries, self.failed_runs, terminated = future.result()
+        except Exception as process_err:  # i.e. the process crashed; none of its directories can be trusted
+            terminated = self.stop_event.is_set()
+            self.failed_runs = [f"\nERROR: {self.name} failed unexpectedly ({process_err!r}) while converting:\n\t" +
+                                "\n\t".join(str(dicom_dir) for dicom_dir in self.dcm_dirs)]
+
+        if not terminated:
             self.signals.signal_send_summaries.emit(self.import_summaries)
             if len(self.failed_runs) > 0:
                 self.signals.signal_send_errors.emit(self.failed_runs)
-
         else:
             self.signals.signal_confirm_terminate.emit()
 
-    @Slot()
-    def slot_stop_import(self):
-        print(f"{self.name} received a termination signal! Terminating at the next available DICOM dir.")
-        self._terminated = True
-
 
 # noinspection PyCallingNonCallable
 class xASL_GUI_Importer(QMainWindow):
     signal_stop_import = Signal()
+    _static_json = {}  # Project directory -> (errors listing, tooltips); these files never change at runtime
 
     def __init__(self, parent_win=None):
         # Parent window is fed into the constructor to allow for communication with parent window devices
         super().__init__(parent=parent_win)
         self.config = parent_win.config
-        with open(Path(self.config["ProjectDir"]) / "JSON_LOGIC" / "ErrorsListing.json") as import_err_reader:
-            self.import_errs = json.load(import_err_reader)
-        with open(Path(self.config["ProjectDir"]) / "JSON_LOGIC" / "ToolTips.json") as import_tooltips_reader:
-            self.import_tips = json.load(import_tooltips_reader)["Importer"]
-        del import_err_reader, import_tooltips_reader
+        self.import_errs, all_tips = self._load_static_json(self.config["ProjectDir"])
+        self.import_tips = all_tips["Importer"]
 
         # Misc and Default Attributes
         self.labfont = QFont()
@@ -98,7 +318,8 @@ class xASL_GUI_Importer(QMainWindow):
         self.lefont = QFont()
         self.lefont.setPointSize(12)
         self.rawdir = ''
-        self.delim = "\\" if system() == "Windows" else "/"
+        self.rootdir_valid = False  # Whether the root directory is an existent directory without spaces
+        self.delim = os.sep
         self.subject_regex = None
         self.visit_regex = None
         self.run_regex = None
@@ -107,9 +328,21 @@ class xASL_GUI_Importer(QMainWindow):
         self.scan_aliases = dict.fromkeys(["ASL4D", "T1", "T2" "M0", "FLAIR"])
         self.cmb_runaliases_dict = {}
         self.threadpool = QThreadPool()
-        self.import_summaries = []
+        self.scan_executor = ThreadPoolExecutor(max_workers=8)  # Lists the directories of a level concurrently
+        self.dir_scanners = []  # Keeps the directory scanners alive until their results have been received
+        self.import_summaries = new_import_summaries()
         self.failed_runs = []
         self.import_workers = []
+        self.import_executor = None  # Process pool in which the DICOM conversions of an import run take place
+        self.import_manager = None  # Hosts the progress queues and stop event shared with those processes
+        self.import_stop_event = None  # Set to have every conversion process stop at its next DICOM dir
+        self.progress_pending = 0  # Directories completed since the progressbar was last repainted
+        self.progress_timer = QTimer(self)  # Repaints the progressbar at most every PROGRESS_INTERVAL seconds
+        self.progress_timer.setSingleShot(True)
+        self.progress_timer.setInterval(int(PROGRESS_INTERVAL * 1000))
+        self.progress_timer.timeout.connect(self.flush_progressbar)
+        self.signal_stop_import.connect(self.slot_stop_import)  # A single connection serves every import run
+        self.dcm2niix_dir = os.fspath(Path(self.config["ProjectDir"]) / "External" / "DCM2NIIX" / f"DCM2NIIX_{_SYSTEM}")
 
         # Window Size and initial visual setup
         self.setWindowTitle("ExploreASL - DICOM to NIFTI Import")
@@ -133,7 +366,7 @@ class xASL_GUI_Importer(QMainWindow):
         # The importer UI setup
         self.mainsplit = QSplitter(Qt.Vertical)
         handle_path = str(Path(self.config["ProjectDir"]) / "media" / "3_dots_horizontal.svg")
-        if system() == "Windows":
+        if IS_WIN:
             handle_path = handle_path.replace("\\", "/")
         handle_style = 'QSplitter::handle {image: url(' + handle_path + ');}'
         self.mainsplit.setStyleSheet(handle_style)
@@ -144,15 +377,16 @@ class xASL_GUI_Importer(QMainWindow):
         self.Setup_UI_UserSpecifyRunAliases()
 
         # Img_vars
-        icon_import = QIcon(str(Path(self.config["ProjectDir"]) / "media" / "import_win10_64x64.png"))
-        icon_terminate = QIcon(str(Path(self.config["ProjectDir"]) / "media" / "stop_processing.png"))
+        media_dir = Path(self.config["ProjectDir"]) / "media"
+        icon_import = cached_icon(str(media_dir / "import_win10_64x64.png"), 40, 40)
+        icon_terminate = cached_icon(str(media_dir / "stop_processing.png"), 40, 40)
 
         # Bottom split: the progressbar and Run/Stop buttons
         self.cont_runbtns = QWidget()
         self.mainsplit.addWidget(self.cont_runbtns)
         self.vlay_runbtns = QVBoxLayout(self.cont_runbtns)
         self.progbar_import = QProgressBar(orientation=Qt.Horizontal, minimum=0, value=0, maximum=1, textVisible=True)
-        if system() == "Darwin":
+        if IS_MAC:
             self.progbar_import.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
         self.btn_run_importer = xASL_PushButton(text="Convert DICOM to NIFTI", func=self.run_importer,
                                                 font=self.labfont, fixed_height=50, enabled=False, icon=icon_import,
@@ -164,17 +398,48 @@ class xASL_GUI_Importer(QMainWindow):
             self.vlay_runbtns.addWidget(widget)
         self.vlay_import.addWidget(self.mainsplit)
 
-        # The dehybridizer UI setup
-        self.dehybridizer = xASL_GUI_Dehybridizer(self)
-        self.vlay_dehybridizer.addWidget(self.dehybridizer)
+        # The dehybridizer UI setup is deferred until the user first switches to its tab
+        self.dehybridizer = None
+        self.central_tab_widget.currentChanged.connect(self.setup_dehybridizer)
 
         # Additional MacOS options
-        if system() == "Darwin":
+        if IS_MAC:
             set_formlay_options(self.formlay_rootdir, vertical_spacing=3)
             set_formlay_options(self.formlay_scanaliases)
             set_formlay_options(self.formlay_runaliases)
             self.vlay_dirstruct.setSpacing(5)
 
+    @Slot(int)
+    def setup_dehybridizer(self, tab_index: int):
+        """
+        Constructs the dehybridizer within its tab the first time that tab is selected
+        :param tab_index: the index of the newly-selected tab
+        """
+        if self.dehybridizer is not None or self.central_tab_widget.widget(tab_index) is not self.cont_dehybridizer:
+            return
+        self.dehybridizer = xASL_GUI_Dehybridizer(self)
+        self.vlay_dehybridizer.addWidget(self.dehybridizer)
+        self.central_tab_widget.currentChanged.disconnect(self.setup_dehybridizer)
+
+    @classmethod
+    def _load_static_json(cls, project_dir: str):
+        """
+        Loads the errors listing and tooltips JSON files, parsing them only once per project directory
+        :param project_dir: the ExploreASL GUI project directory containing the JSON_LOGIC folder
+        :return: a tuple of the errors listing dict and the tooltips dict
+        """
+        if project_dir not in cls._static_json:
+            json_dir = Path(project_dir) / "JSON_LOGIC"
+            parsed = []
+            for filename in ["ErrorsListing.json", "ToolTips.json"]:
+                if orjson is not None:
+                    parsed.append(orjson.loads((json_dir / filename).read_bytes()))
+                else:
+                    with open(json_dir / filename) as json_reader:
+                        parsed.append(json.load(json_reader))
+            cls._static_json[project_dir] = tuple(parsed)
+        return cls._static_json[project_dir]
+
     def Setup_UI_UserSpecifyDirStuct(self):
         self.grp_dirstruct = QGroupBox(title="Specify Directory Structure")
         self.vlay_dirstruct = QVBoxLayout(self.grp_dirstruct)
@@ -217,27 +482,30 @@ class xASL_GUI_Importer(QMainWindow):
         self.lab_rootlabel = QLabel(text="root")
         self.lab_rootlabel.setFont(self.labfont)
         self.levels = {}
-        for idx, (level, func) in enumerate(zip(["Level1", "Level2", "Level3", "Level4", "Level5", "Level6", "Level7"],
-                                                [self.get_nth_level_dirs] * 7)):
+        for idx in range(7):
             le = DandD_Label2LineEdit(self, self.grp_dirstruct, idx)
+            le.setFont(self.lefont)
             le.modified_text.connect(self.get_nth_level_dirs)
             le.textChanged.connect(self.update_sibling_awareness)
             le.textChanged.connect(self.is_ready_import)
             le.setToolTip(f"This field accepts a drag & droppable label describing the information found at\n"
                           f"a directory depth of {idx + 1} after the root folder")
-            self.levels[level] = le
-
-        self.hlay_receivers.addWidget(self.lab_rootlabel)
-        lab_sep = QLabel(text=self.delim)
-        lab_sep.setFont(self.labfont)
-        self.hlay_receivers.addWidget(lab_sep)
-        for ii, level in enumerate(self.levels.values()):
-            level.setFont(self.lefont)
-            self.hlay_receivers.addWidget(level)
-            if ii < 6:
-                lab_sep = QLabel(text=self.delim)
-                lab_sep.setFont(self.labfont)
-                self.hlay_receivers.addWidget(lab_sep)
+            self.levels[f"Level{idx + 1}"] = le
+        self.level_les = tuple(self.levels.values())  # The levels never change after this point; freeze their order
+
+        # Lay out the root label followed by each level, with a separator label between each pair of widgets
+        lab_font = self.labfont
+
+        def make_separator():
+            lab_sep = QLabel(text=self.delim)
+            lab_sep.setFont(lab_font)
+            return lab_sep
+
+        receivers = [self.lab_rootlabel, *self.level_les]
+        separators = [make_separator() for _ in range(len(receivers) - 1)]
+        for widget in chain.from_iterable(zip(receivers, separators)):
+            self.hlay_receivers.addWidget(widget)
+        self.hlay_receivers.addWidget(receivers[-1])
 
         # Include the button that will clear the current structure for convenience
         self.btn_clear_receivers = QPushButton("Clear the fields", self.grp_dirstruct, clicked=self.clear_receivers)
@@ -265,7 +533,7 @@ class xASL_GUI_Importer(QMainWindow):
             cmb.currentTextChanged.connect(self.is_ready_import)
             self.cmb_scanaliases_dict[scantype] = cmb
             self.formlay_scanaliases.addRow(description, cmb)
-            if system() == "Darwin":
+            if IS_MAC:
                 cmb.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
 
         self.mainsplit.addWidget(self.grp_scanaliases)
@@ -300,12 +568,15 @@ class xASL_GUI_Importer(QMainWindow):
     # Purpose of this function is to change the value of the rawdir attribute based on the current text
     @Slot()
     def set_rootdir_variable(self, path: str):
+        # The validity of the root directory is only re-assessed here, when its text actually changes
         if path == '':
             self.rawdir = ""
+            self.rootdir_valid = False
             return
-        path = Path(path)
-        if path.exists() and path.is_dir():
+        is_dir = os.path.isdir(path)
+        if is_dir:
             self.rawdir = self.le_rootdir.text()
+        self.rootdir_valid = is_dir and " " not in path
 
     def get_nth_level_dirs(self, dir_type: str, level: int):
         """
@@ -327,58 +598,81 @@ class xASL_GUI_Importer(QMainWindow):
         if dir_type == '':
             return
 
-        try:
-            delimiter = "\\" if system() == "Windows" else "/"
-            glob_string = delimiter.join(["*"] * (level + 1))
-            paths = [(str(direc), str(direc.name)) for direc in Path(self.rawdir).glob(glob_string)]
-            directories, basenames = zip(*paths)
+        # Walk the directories off of the GUI thread; re-drops only re-list the directories that changed in the meantime
+        scanner = Importer_DirScanner(rawdir=self.rawdir, dir_type=dir_type, level=level, executor=self.scan_executor)
+        scanner.signals.signal_send_dirs.connect(self.slot_receive_nth_level_dirs)
+        self.dir_scanners.append(scanner)
+        self.threadpool.start(scanner)
 
-        except ValueError:
-            robust_qmsg(self, title=self.import_errs["ImpossibleDirDepth"][0],
-                        body=self.import_errs["ImpossibleDirDepth"][1])
-            # Clear the appropriate lineedit that called this function after the error message
-            list(self.levels.values())[level].clear()
+    @Slot(str, str, int, list)
+    def slot_receive_nth_level_dirs(self, rawdir: str, dir_type: str, level: int, found_dirs: list):
+        """
+        Receives the directories found by a directory scanner and processes them if they are still relevant to what is
+        currently specified
+        :param rawdir: the raw directory that was scanned
+        :param dir_type: whether this is a subject, visit, run or scan
+        :param level: which lineedit, in python index terms, requested the scan
+        :param found_dirs: the directories found at that level
+        """
+        self.dir_scanners = [scanner for scanner in self.dir_scanners if scanner.signals is not self.sender()]
+
+        # Stale results (the root directory changed or the label was replaced during the scan) are not processed
+        if rawdir != self.rawdir or self.level_les[level].text() != dir_type:
             return
+        self.process_nth_level_dirs(dir_type=dir_type, level=level, found_dirs=found_dirs)
+
+    def process_nth_level_dirs(self, dir_type: str, level: int, found_dirs: List[str]):
+        """
+        :param dir_type: whether this is a subject, visit, run or scan
+        :param level: which lineedit, in python index terms, emitted this signal
+        :param found_dirs: the directories found at that level
+        """
+        basenames = [os.path.basename(dirpath) for dirpath in found_dirs]
 
         # Do not proceed if no directories were found and clear the linedit that emitted the textChanged signal
-        if len(directories) == 0:
-            idx = list(self.levels.keys())[level]
-            print(f"{idx=}")
-            self.levels[idx].clear()
+        if len(basenames) == 0:
+            robust_qmsg(self, title=self.import_errs["ImpossibleDirDepth"][0],
+                        body=self.import_errs["ImpossibleDirDepth"][1])
+            self.level_les[level].clear()
             return
 
-        # Otherwise, make the appropriate adjustment depending on which label was dropped in
+        # Otherwise, make the appropriate adjustment depending on which label was dropped in. The unique basenames are
+        # found in a single pass; their sorted form is shared by the regex inference (as its cache key) and the scans
+        unique_basenames = _ordered_unique(basenames)
+        sorted_basenames = tuple(sorted(unique_basenames))
         if dir_type == "Subject":
-            self.subject_regex = self.infer_regex(list(basenames))
-            print(f"Subject regex: {self.subject_regex}")
-            del directories, basenames
+            self.subject_regex = _compile(infer_regex(sorted_basenames))
+            if self.config["DeveloperMode"]:
+                print(f"Subject regex: {self.subject_regex.pattern}")
 
         elif dir_type == "Visit":
-            self.visit_regex = self.infer_regex(list(basenames))
-            print(f"Visit regex: {self.visit_regex}")
-            del directories, basenames
+            self.visit_regex = _compile(infer_regex(sorted_basenames))
+            if self.config["DeveloperMode"]:
+                print(f"Visit regex: {self.visit_regex.pattern}")
 
         elif dir_type == "Run":
-            self.run_regex = self.infer_regex(list(set(basenames)))
-            print(f"Run regex: {self.run_regex}")
-            self.reset_run_aliases(basenames=list(set(basenames)))
-            del directories, basenames
+            self.run_regex = _compile(infer_regex(sorted_basenames))
+            if self.config["DeveloperMode"]:
+                print(f"Run regex: {self.run_regex.pattern}")
+            self.reset_run_aliases(basenames=unique_basenames)
 
         elif dir_type == "Scan":
-            self.scan_regex = self.infer_regex(list(set(basenames)))
-            print(f"Scan regex: {self.scan_regex}")
-            self.reset_scan_alias_cmbs(basenames=sorted(set(basenames)))
-            del directories, basenames
+            self.scan_regex = _compile(infer_regex(sorted_basenames))
+            if self.config["DeveloperMode"]:
+                print(f"Scan regex: {self.scan_regex.pattern}")
+            self.reset_scan_alias_cmbs(basenames=list(sorted_basenames))
 
         elif dir_type == "Dummy":
-            del directories, basenames
             return
 
         else:
-            del directories, basenames
             print("Error. This should never print")
             return
 
+        # The scan completes after the textChanged signal has already triggered a readiness check; check again now that
+        # the regex has been established
+        self.is_ready_import()
+
     #####################################
     # SECTION - RESET AND CLEAR FUNCTIONS
     #####################################
@@ -407,7 +701,7 @@ class xASL_GUI_Importer(QMainWindow):
         this function will accomodate that change by resetting the variable that may have been removed
         during the drop
         """
-        used_directories = [le.text() for le in self.levels.values()]
+        used_directories = [le.text() for le in self.level_les]
         # If subjects is not in the currently-specified structure and the regex has been already set
         if "Subject" not in used_directories and self.subject_regex is not None:
             self.subject_regex = None
@@ -431,7 +725,7 @@ class xASL_GUI_Importer(QMainWindow):
         """
         Convenience function for resetting the drop-enabled lineedits
         """
-        for le in self.levels.values():
+        for le in self.level_les:
             le.clear()
 
     def reset_scan_alias_cmbs(self, basenames=None):
@@ -442,17 +736,16 @@ class xASL_GUI_Importer(QMainWindow):
         if basenames is None:
             basenames = []
 
-        # Must first disconnect the combobox or else update_scan_aliases goes berserk because the index
-        # will be reset for each combobox in the process. Reconnect after changes.
+        # Must first block the combobox signals or else update_scan_aliases goes berserk because the index
+        # will be reset for each combobox in the process
+        items = ["Select an alias"] + basenames
+        if self.config["DeveloperMode"]:
+            print(f"reset_scan_alias_cmbs resetting the comboboxes for keys {list(self.cmb_scanaliases_dict)}")
         cmb: QComboBox
-        for key, cmb in self.cmb_scanaliases_dict.items():
-            print(f"reset_scan_alias_cmbs resettings for key {key}")
-            cmb.currentTextChanged.disconnect(self.update_scan_aliases)
-            cmb.currentTextChanged.disconnect(self.is_ready_import)
-            cmb.clear()
-            cmb.addItems(["Select an alias"] + basenames)
-            cmb.currentTextChanged.connect(self.update_scan_aliases)
-            cmb.currentTextChanged.connect(self.is_ready_import)
+        for cmb in self.cmb_scanaliases_dict.values():
+            with QSignalBlocker(cmb):
+                cmb.clear()
+                cmb.insertItems(0, items)
 
     def update_scan_aliases(self):
         """
@@ -469,8 +762,12 @@ class xASL_GUI_Importer(QMainWindow):
         Removes all row widgets from the runs section. Clears the lineedits dict linking directory names to user-
         preferred aliases. Clears the comboboxes dictionary specifying order.
         """
-        for idx in range(self.formlay_runaliases.rowCount()):
-            self.formlay_runaliases.removeRow(0)
+        # Remove from the last row onwards so that the remaining rows never need to be re-indexed, and hold off
+        # on repainting the container until all rows are gone
+        self.cont_runaliases.setUpdatesEnabled(False)
+        for idx in reversed(range(self.formlay_runaliases.rowCount())):
+            self.formlay_runaliases.removeRow(idx)
+        self.cont_runaliases.setUpdatesEnabled(True)
         self.le_runaliases_dict.clear()
         self.cmb_runaliases_dict.clear()
 
@@ -487,18 +784,15 @@ class xASL_GUI_Importer(QMainWindow):
         if len(self.le_runaliases_dict) > 0:
             self.clear_run_alias_cmbs_and_les()
 
-        # Generate the new dict mappings of directory basename to preferred alias name and mapping
+        # Repopulate the format layout, and establish mappings for the lineedits and the comboboxes
         # runaliases_dict has keys that are the basenames of the path depth corresponding to runs and values that are
         # the lineedit and combobox widgets
-        self.le_runaliases_dict = dict.fromkeys(basenames)
-        self.cmb_runaliases_dict = dict.fromkeys(basenames)
-
-        # Repopulate the format layout, and establish mappings for the lineedits and the comboboxes
-        for ii, key in enumerate(self.le_runaliases_dict):
+        nums_to_add = [str(num) for num in range(1, len(basenames) + 1)]
+        row_widgets = []
+        for ii, key in enumerate(basenames):
             hlay = QHBoxLayout()
             cmb = QComboBox()
             cmb.setToolTip(self.import_tips["cmb_runposition"])
-            nums_to_add = [str(num) for num in range(1, len(self.le_runaliases_dict) + 1)]
             cmb.addItems(nums_to_add)
             cmb.setCurrentIndex(ii)
             cmb.currentIndexChanged.connect(self.is_ready_import)
@@ -507,37 +801,27 @@ class xASL_GUI_Importer(QMainWindow):
             hlay.addWidget(le)
             hlay.addWidget(cmb)
             self.formlay_runaliases.addRow(key, hlay)
-            # This is where the mappings are re-established
-            self.le_runaliases_dict[key] = le
-            self.cmb_runaliases_dict[key] = cmb
-            if system() == "Darwin":
+            row_widgets.append((key, le, cmb))
+            if IS_MAC:
                 le.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
                 cmb.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
 
+        # This is where the mappings are re-established
+        self.le_runaliases_dict = {key: le for key, le, _ in row_widgets}
+        self.cmb_runaliases_dict = {key: cmb for key, _, cmb in row_widgets}
+
     ##########################
     # SECTION - MISC FUNCTIONS
     ##########################
 
-    @staticmethod
-    def infer_regex(list_of_strings):
-        """
-        Self-explanatory: deduces a regex string to match a provided list of strings
-        :param list_of_strings: the list of string to be matched
-        :return: The inferred regex string matching the all the items in the list of strings
-        """
-        extractor = rexpy.Extractor(list_of_strings)
-        extractor.extract()
-        regex = extractor.results.rex[0]
-        return regex
-
     @Slot()
     def update_sibling_awareness(self):
         """
         Updates the awareness of what each drop-enabled lineedits contain such that certain variables cannot be dropped
         in for multiple lineedits
         """
-        current_texts = [le.text() for le in self.levels.values()]
-        for le in self.levels.values():
+        current_texts = frozenset(le.text() for le in self.level_les)
+        for le in self.level_les:
             le.sibling_awareness = current_texts
 
     @Slot()
@@ -545,15 +829,19 @@ class xASL_GUI_Importer(QMainWindow):
         """
         Quality controls several conditions required in order to be able to run the Importer.
         """
-        current_texts = [le.text() for le in self.levels.values()]
-        rootpath = Path(self.le_rootdir.text())
         # First requirement; raw directory must be an existent directory without spaces
-        if any([not rootpath.exists(), not rootpath.is_dir(), " " in self.le_rootdir.text()]):
+        if not self.rootdir_valid:
             self.btn_run_importer.setEnabled(False)
             return
 
-            # Next requirement; a minimum of "Subject" and "Scan" must be present in the lineedits
-        if not all(["Subject" in current_texts, "Scan" in current_texts]):
+        # Next requirement; a minimum of "Subject" and "Scan" must be present in the lineedits
+        current_texts = [le.text() for le in self.level_les]
+        if "Subject" not in current_texts or "Scan" not in current_texts:
+            self.btn_run_importer.setEnabled(False)
+            return
+
+        # Next requirement; the scans of those levels must have completed and established their regexes
+        if self.subject_regex is None or self.scan_regex is None:
             self.btn_run_importer.setEnabled(False)
             return
 
@@ -587,7 +875,7 @@ class xASL_GUI_Importer(QMainWindow):
         self.le_rootdir.setEnabled(state)
 
         le: QLineEdit
-        for le in self.levels.values():
+        for le in self.level_les:
             le.setEnabled(state)
 
         cmb: QComboBox
@@ -601,7 +889,7 @@ class xASL_GUI_Importer(QMainWindow):
         """
         Returns the directory structure in preparation of running the import
         """
-        dirnames = [le.text() for le in self.levels.values()]
+        dirnames = [le.text() for le in self.level_les]
         valid_dirs = []
         encountered_nonblank = False
         # Iterate backwards to remove false
@@ -650,26 +938,26 @@ class xASL_GUI_Importer(QMainWindow):
         if len(self.cmb_runaliases_dict) == 0:
             return True, run_aliases
 
+        # Gather the basename, alias and order of each row in a single pass
+        basename_keys, aliases, orders = zip(*((basename, le.text(), cmb.currentText()) for (basename, le), cmb in
+                                               zip(self.le_runaliases_dict.items(), self.cmb_runaliases_dict.values())))
+
         # First, make sure that every number is unique:
-        current_orderset = [cmb.currentText() for cmb in self.cmb_runaliases_dict.values()]
-        if len(current_orderset) != len(set(current_orderset)):
+        order_to_idx = {order: idx for idx, order in enumerate(orders)}
+        if len(order_to_idx) != len(orders):
             robust_qmsg(self, title=self.import_errs["InvalidRunAliases"][0],
                         body=self.import_errs["InvalidRunAliases"][1])
             return False, run_aliases
 
-        basename_keys = list(self.le_runaliases_dict.keys())
-        aliases = list(le.text() for le in self.le_runaliases_dict.values())
-        orders = list(cmb.currentText() for cmb in self.cmb_runaliases_dict.values())
-
         if self.config["DeveloperMode"]:
             print(f"Inside get_run_aliases, the following variable values were in play prior to generating the "
                   f"run aliases dict:\n"
-                  f"basename_keys: {basename_keys}\n"
-                  f"aliases: {aliases}\n"
-                  f"orders: {orders}")
+                  f"basename_keys: {list(basename_keys)}\n"
+                  f"aliases: {list(aliases)}\n"
+                  f"orders: {list(orders)}")
 
         for num in range(1, len(orders) + 1):
-            idx = orders.index(str(num))
+            idx = order_to_idx[str(num)]
             current_alias = aliases[idx]
             current_basename = basename_keys[idx]
             if current_alias == '':
@@ -686,33 +974,50 @@ class xASL_GUI_Importer(QMainWindow):
         directory_status, valid_directories = self.get_directory_structure()
         scanalias_status, scan_aliases = self.get_scan_aliases()
         runalias_status, run_aliases = self.get_run_aliases()
-        if any([self.subject_regex == '',  # Subject regex must be established
-                self.scan_regex == '',  # Scan regex must be established
+        if any((self.subject_regex is None,  # Subject regex must be established
+                self.scan_regex is None,  # Scan regex must be established
                 not directory_status,  # Getting the directory structure must have been successful
                 not scanalias_status,  # Getting the scan aliases must have been successful
                 not runalias_status  # Getting the run aliases must have been successful
-                ]):
+                )):
             return None
 
         # Otherwise, green light to create the import parameters
         import_parms["RawDir"] = self.le_rootdir.text()
-        import_parms["Regex"] = [self.subject_regex, self.run_regex, self.scan_regex]
+        import_parms["Regex"] = [regex.pattern if regex is not None else None
+                                 for regex in [self.subject_regex, self.run_regex, self.scan_regex]]
         import_parms["Directory Structure"] = valid_directories
         import_parms["Scan Aliases"] = scan_aliases
         import_parms["Ordered Run Aliases"] = run_aliases
 
         # Save a copy of the import parms to the raw directory in question
-        with open(Path(self.le_rootdir.text()) / "ImportConfig.json", 'w') as w:
-            json.dump(import_parms, w, indent=3)
+        write_json(Path(self.le_rootdir.text()) / "ImportConfig.json", import_parms)
 
         return import_parms
 
     #############################################
     # SECTION - CONCURRENT AND POST-RUN FUNCTIONS
     #############################################
+    @Slot(int)
+    def slot_update_progressbar(self, n_completed: int):
+        # Updates from all workers are pooled and applied together once the timer fires
+        self.progress_pending += n_completed
+        if not self.progress_timer.isActive():
+            self.progress_timer.start()
+
     @Slot()
-    def slot_update_progressbar(self):
-        self.progbar_import.setValue(self.progbar_import.value() + 1)
+    def flush_progressbar(self):
+        self.progress_timer.stop()
+        if self.progress_pending > 0:
+            self.progbar_import.setValue(self.progbar_import.value() + self.progress_pending)
+            self.progress_pending = 0
+
+    @Slot()
+    def slot_stop_import(self):
+        if self.import_stop_event is None:
+            return
+        print("The import received a termination signal! Terminating at the next available DICOM dir.")
+        self.import_stop_event.set()
 
     @Slot()
     def slot_cleanup_postterminate(self):
@@ -727,6 +1032,7 @@ class xASL_GUI_Importer(QMainWindow):
             return
 
         # Reset the widgets and cursor
+        self.shutdown_import_processes()
         self.set_widgets_on_or_off(state=True)
         self.btn_terminate_importer.setEnabled(False)
 
@@ -736,16 +1042,16 @@ class xASL_GUI_Importer(QMainWindow):
                         body=self.import_errs["CleanupImportPostTerm"][1], variables=[str(analysis_dir)])
         QApplication.restoreOverrideCursor()
 
-    @Slot(list)
-    def slot_is_ready_postprocessing(self, signalled_summaries: list):
+    @Slot(dict)
+    def slot_is_ready_postprocessing(self, signalled_summaries: dict):
         """
         Creates the summary file. Increments the "debt" due to launching workers back towards zero. Resets widgets
         once importer workers are done.
-        :param signalled_summaries: A list of dicts, each dict being all the relevant DICOM and NIFTI parameters of
-        a converted directory
+        :param signalled_summaries: A dict of equal-length lists, holding all the relevant DICOM and NIFTI parameters
+        of each converted directory
         """
         # Stockpile the completed summaries and increment the "debt" back towards zero
-        self.import_summaries.extend(signalled_summaries)
+        extend_import_summaries(self.import_summaries, signalled_summaries)
         self.n_import_workers -= 1
 
         # Don't proceed until all importer workers are finished
@@ -765,18 +1071,33 @@ class xASL_GUI_Importer(QMainWindow):
         """
         self.failed_runs.extend(signalled_failed_runs)
 
+    def shutdown_import_processes(self):
+        """
+        Releases the process pool and manager used by the most recent import run
+        """
+        if self.import_executor is not None:
+            self.import_executor.shutdown(wait=False)
+            self.import_executor = None
+        if self.import_manager is not None:
+            self.import_manager.shutdown()
+            self.import_manager = None
+            self.import_stop_event = None
+
     def import_postprocessing(self):
         """
         Performs the bulk of the post-import work, especially if the import type was specified to be BIDS
         """
+        self.flush_progressbar()
         print("Clearing Import workers from memory, re-enabling widgets, and resetting current directory")
         self.import_workers.clear()
+        self.shutdown_import_processes()
         self.set_widgets_on_or_off(state=True)
         self.btn_terminate_importer.setEnabled(False)
         QApplication.restoreOverrideCursor()
 
         chdir(self.config["ScriptsDir"])
-        analysis_dir = Path(self.import_parms["RawDir"]).parent / "analysis"
+        raw_dir = self.import_parms["RawDir"]
+        analysis_dir = Path(raw_dir).parent / "analysis"
         if not analysis_dir.exists():
             robust_qmsg(self, title=self.import_errs["StudyDirNeverMade"][0],
                         body=self.import_errs["StudyDirNeverMade"][1], variables=[str(analysis_dir)])
@@ -784,24 +1105,23 @@ class xASL_GUI_Importer(QMainWindow):
 
         # Concatenate the tmpImport_Converter_###.log files into a single log placed in the study directory
         # Also, remove the log files in the process
-        logs = []
-        log_files = sorted(Path(self.import_parms["RawDir"]).glob("tmpImport_Converter*.log"))
-        for log_file in log_files:
-            with open(log_file, "r") as log_reader:
-                logs.append(log_reader.read())
-            log_file.unlink(missing_ok=True)
-
+        with os.scandir(raw_dir) as entries:
+            log_files = sorted(entry.path for entry in entries if entry.name.startswith("tmpImport_Converter") and
+                               entry.name.endswith(".log") and entry.is_file())
         now_str = datetime.now().strftime("%a-%b-%d-%Y_%H-%M-%S")
+        import_logs_dir = analysis_dir / "Logs" / "Import Logs"
+        import_logs_dir.mkdir(parents=True, exist_ok=True)
         try:
-            log_path = analysis_dir / "Logs" / "Import Logs" / f"Import_Log_{now_str}.log"
-            log_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(log_path, "w") as log_writer:
-                log_writer.write(f"\n{'#' * 50}\n".join(logs))
+            log_path = import_logs_dir / f"Import_Log_{now_str}.log"
+            self.concatenate_logs(log_files, log_path, separator=LOG_SEPARATOR)
         except PermissionError:
-            log_path = analysis_dir / "Logs" / "Import Logs" / f"Import_Log_{now_str}_backup.log"
-            log_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(log_path, "w") as log_writer:
-                log_writer.write("\n\n".join(logs))
+            log_path = import_logs_dir / f"Import_Log_{now_str}_backup.log"
+            self.concatenate_logs(log_files, log_path, separator="\n\n")
+        for log_file in log_files:
+            try:
+                os.unlink(log_file)
+            except FileNotFoundError:
+                pass
 
         # Create the import summary
         create_import_summary(import_summaries=self.import_summaries, config=self.import_parms)
@@ -815,16 +1135,13 @@ class xASL_GUI_Importer(QMainWindow):
             self.create_dataset_description_template(analysis_dir)
 
             # Create the "bidsignore" file
-            with open(analysis_dir / ".bidsignore", 'w') as ignore_writer:
-                to_ignore = ["Import_Log_*.log\n", "Import_Failed*.txt\n", "Import_Dataframe_*.tsv\n"]
-                ignore_writer.writelines(to_ignore)
-                del to_ignore
+            (analysis_dir / ".bidsignore").write_bytes(BIDSIGNORE)
 
         # If there were any failures, write them to disk now
         if len(self.failed_runs) > 0:
             try:
                 with open(analysis_dir / "Import_Failed_Imports.txt", "w") as failed_writer:
-                    failed_writer.writelines([line + "\n" for line in self.failed_runs])
+                    failed_writer.write("\n".join(self.failed_runs) + "\n")
                 robust_qmsg(self, title=self.import_errs["ImportErrors"][0], body=self.import_errs["ImportErrors"][1],
                             variables=[log_path.name, str(analysis_dir)])
             except FileNotFoundError:
@@ -836,26 +1153,29 @@ class xASL_GUI_Importer(QMainWindow):
                                     f"You have successfully imported the DICOM dataset into NIFTI format.\n"
                                     f"The study directory is located at:\n{str(analysis_dir)}", QMessageBox.Ok)
 
+    @staticmethod
+    def concatenate_logs(log_files: List[str], log_path: Path, separator: str):
+        """
+        Streams several log files into a single log, one buffer at a time, such that no log is ever fully read into
+        memory
+        :param log_files: the log files to concatenate, in order
+        :param log_path: the filepath of the combined log
+        :param separator: the text written between the contents of consecutive log files
+        """
+        with open(log_path, "w") as log_writer:
+            for idx, log_file in enumerate(log_files):
+                if idx > 0:
+                    log_writer.write(separator)
+                with open(log_file, "r") as log_reader:
+                    shutil.copyfileobj(log_reader, log_writer, 1 << 20)
+
     @staticmethod
     def create_dataset_description_template(analysis_dir: Path):
         """
         Creates a template for the dataset description file for the user to complete at a later point in time
         :param analysis_dir: The analysis directory where the dataset description will be saved to.
         """
-        template = {
-            "BIDSVersion": "0.1.0",
-            "License": "CC0",
-            "Name": "A multi-subject, multi-modal human neuroimaging dataset",
-            "Authors": [],
-            "Acknowledgements": "",
-            "HowToAcknowledge": "This data was obtained from [owner]. "
-                                "Its accession number is [id number]'",
-            "ReferencesAndLinks": ["https://www.ncbi.nlm.nih.gov/pubmed/25977808",
-                                   "https://openfmri.org/dataset/ds000117/"],
-            "Funding": ["UK Medical Research Council (MC_A060_5PR10)"]
-        }
-        with open(analysis_dir / "dataset_description.json", 'w') as dataset_writer:
-            json.dump(template, dataset_writer, indent=3)
+        write_json(analysis_dir / "dataset_description.json", DATASET_DESCRIPTION_TEMPLATE)
 
     ########################
     # SECTION - RUN FUNCTION
@@ -875,7 +1195,7 @@ class xASL_GUI_Importer(QMainWindow):
         self.set_widgets_on_or_off(state=False)
 
         # Ensure the dcm2niix path is visible
-        chdir(Path(self.config["ProjectDir"]) / "External" / "DCM2NIIX" / f"DCM2NIIX_{system()}")
+        chdir(self.dcm2niix_dir)
 
         # Get the import parameters
         self.import_parms = self.get_import_parms()
@@ -889,8 +1209,10 @@ class xASL_GUI_Importer(QMainWindow):
         subject_dirs: List[Tuple[Path]] = get_dicom_directories(config=self.import_parms)
 
         # Set the progressbar
+        self.progress_timer.stop()
+        self.progress_pending = 0
         self.progbar_import.setValue(0)
-        self.progbar_import.setMaximum(len(list(collapse(subject_dirs))))
+        self.progbar_import.setMaximum(sum(map(len, subject_dirs)))
 
         if self.config["DeveloperMode"]:
             print("Detected the following dicom directories:")
@@ -899,14 +1221,19 @@ class xASL_GUI_Importer(QMainWindow):
 
         NTHREADS = min([len(subject_dirs), 4])
         # NTHREADS = 1  # For troubleshooting
+        self.import_executor = ProcessPoolExecutor(max_workers=NTHREADS)
+        self.import_manager = Manager()
+        self.import_stop_event = self.import_manager.Event()
         for idx, subjects_subset in enumerate(divide(NTHREADS, subject_dirs)):
-            dicom_dirs = flatten(subjects_subset)
+            dicom_dirs = chain.from_iterable(subjects_subset)
             worker = Importer_Worker(dcm_dirs=dicom_dirs,  # The list of dicom directories
                                      config=self.import_parms,  # The import parameters
                                      use_legacy_mode=self.chk_uselegacy.isChecked(),
-                                     name=f"Converter_{str(idx).zfill(3)}"
+                                     name=f"Converter_{str(idx).zfill(3)}",
+                                     executor=self.import_executor,
+                                     manager=self.import_manager,
+                                     stop_event=self.import_stop_event
                                      )  # Whether to use legacy mode or not
-            self.signal_stop_import.connect(worker.slot_stop_import)
             worker.signals.signal_send_summaries.connect(self.slot_is_ready_postprocessing)
             worker.signals.signal_send_errors.connect(self.slot_update_failed_runs_log)
             worker.signals.signal_confirm_terminate.connect(self.slot_cleanup_postterminate)
@@ -928,34 +1255,25 @@ class DraggableLabel(QLabel):
     Modified QLabel to support dragging out the text content
     """
 
+    _STYLE = """
+    QLabel {
+        border-style: solid;
+        border-width: 2px;
+        border-color: black;
+        border-radius: 10px;
+        background-color: white;
+    }
+    """
+    _FONT = None  # Shared by all labels; created with the first label, as a QFont requires a running QApplication
+
     def __init__(self, text='', parent=None):
         super(DraggableLabel, self).__init__(parent)
         self.setText(text)
-        style_windows = """
-        QLabel {
-            border-style: solid;
-            border-width: 2px;
-            border-color: black;
-            border-radius: 10px;
-            background-color: white;
-        }
-        """
-        style_unix = """
-        QLabel {
-            border-style: solid;
-            border-width: 2px;
-            border-color: black;
-            border-radius: 10px;
-            background-color: white;
-        }
-        """
-        if system() == "Windows":
-            self.setStyleSheet(style_windows)
-        else:
-            self.setStyleSheet(style_unix)
-        font = QFont()
-        font.setPointSize(16)
-        self.setFont(font)
+        self.setStyleSheet(DraggableLabel._STYLE)
+        if DraggableLabel._FONT is None:
+            DraggableLabel._FONT = QFont()
+            DraggableLabel._FONT.setPointSize(16)
+        self.setFont(DraggableLabel._FONT)
         # self.setMinimumHeight(75)
         # self.setMaximumHeight(100)
         self.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Expanding)
@@ -991,22 +1309,27 @@ class DandD_Label2LineEdit(QLineEdit):
         self.setAcceptDrops(True)
         self.setReadOnly(True)
         self.superparent = superparent  # This is the Importer Widget itself
-        self.sibling_awareness = [''] * 7
+        self.sibling_awareness = frozenset([''])  # The texts of all drop-enabled lineedits, including this one
         self.id = identification  # This is the python index of which level after ..\\raw does this lineedit represent
         self.textChanged.connect(self.modifiedtextChanged)
 
+    def can_accept(self, text: str) -> bool:
+        """
+        Whether the dragged text may be dropped into this lineedit
+        :param text: the text of the drag event's mime data
+        """
+        return (text not in self.sibling_awareness and self.superparent.le_rootdir.text() != '') or text == "Dummy"
+
     def dragEnterEvent(self, event: QDragEnterEvent) -> None:
         if event.mimeData().hasText():
-            if all([event.mimeData().text() not in self.sibling_awareness,
-                    self.superparent.le_rootdir.text() != '']) or event.mimeData().text() == "Dummy":
+            if self.can_accept(event.mimeData().text()):
                 event.accept()
         else:
             event.ignore()
 
     def dragMoveEvent(self, event: QDragMoveEvent) -> None:
         if event.mimeData().hasText():
-            if all([event.mimeData().text() not in self.sibling_awareness,
-                    self.superparent.le_rootdir.text() != '']) or event.mimeData().text() == "Dummy":
+            if self.can_accept(event.mimeData().text()):
                 event.accept()
                 event.setDropAction(Qt.CopyAction)
         else:
@@ -1014,10 +1337,10 @@ class DandD_Label2LineEdit(QLineEdit):
 
     def dropEvent(self, event: QDropEvent) -> None:
         if event.mimeData().hasText():
-            if all([event.mimeData().text() not in self.sibling_awareness,
-                    self.superparent.le_rootdir.text() != '']) or event.mimeData().text() == "Dummy":
+            text = event.mimeData().text()
+            if self.can_accept(text):
                 event.accept()
-                self.setText(event.mimeData().text())
+                self.setText(text)
         else:
             event.ignore()
 
@@ -213,7 +213,8 @@ class xASL_MainWin(QMainWindow):
         self.plotter.config = self.config
         self.executor.config = self.config
         self.importer.config = self.config
-        self.importer.dehybridizer.config = self.config
+        if self.importer.dehybridizer is not None:
+            self.importer.dehybridizer.config = self.config
 
     # This will be modified in the future to perform certain actions on end
     def closeEvent(self, event):
@@ -0,0 +1,48 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+try:
+    from src.xASL_GUI_FileExplorer import xASL_FileWorker
+except ImportError:  # PySide2 is not installed
+    xASL_FileWorker = None
+
+
+@unittest.skipIf(xASL_FileWorker is None, "PySide2 is required to import the file explorer")
+class TestFileWorkerPaste(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmpdir.name)
+        self.dst = self.root / "dst"
+        self.dst.mkdir()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def paste(self, srcs):
+        worker = xASL_FileWorker(srcs=srcs, dst=self.dst, task="Paste")
+        worker._do_paste()
+
+    def test_sources_sharing_a_basename_are_both_copied(self):
+        srcs = []
+        for folder in ["a", "b"]:
+            (self.root / folder).mkdir()
+            src = self.root / folder / "x.txt"
+            src.write_text(folder)
+            srcs.append(src)
+        self.paste(srcs)
+        self.assertEqual((self.dst / "x.txt").read_text(), "a")
+        self.assertEqual((self.dst / "x - Copy.txt").read_text(), "b")
+
+    def test_pasting_a_file_onto_itself_makes_a_copy(self):
+        src = self.dst / "x.txt"
+        src.write_text("x")
+        self.paste([src])
+        self.paste([src])
+        self.assertEqual(src.read_text(), "x")
+        self.assertEqual((self.dst / "x - Copy.txt").read_text(), "x")
+        self.assertEqual((self.dst / "x - Copy_2.txt").read_text(), "x")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from shutil import SameFileError
+
+from src.xASL_GUI_HelperFuncs_DirOps import fast_copyfile, merge_directories
+
+
+class TestFastCopyfile(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmpdir.name)
+        self.src = self.root / "src.txt"
+        self.src.write_text("contents")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_copies_contents(self):
+        dst = self.root / "dst.txt"
+        fast_copyfile(self.src, dst)
+        self.assertEqual(dst.read_text(), "contents")
+
+    def test_same_file_raises_without_truncating(self):
+        with self.assertRaises(SameFileError):
+            fast_copyfile(self.src, self.src)
+        self.assertEqual(self.src.read_text(), "contents")
+
+    @unittest.skipUnless(hasattr(os, "symlink"), "symlinks are unavailable on this platform")
+    def test_symlink_to_source_is_never_truncated(self):
+        link = self.root / "link.txt"
+        os.symlink(self.src, link)
+        with self.assertRaises(SameFileError):
+            fast_copyfile(self.src, link)
+        self.assertEqual(self.src.read_text(), "contents")
+
+
+@unittest.skipUnless(hasattr(os, "symlink"), "symlinks are unavailable on this platform")
+class TestMergeDirectoriesCopy(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.study = Path(self.tmpdir.name) / "study"
+        (self.study / "sub-01").mkdir(parents=True)
+        self.src = self.study / "sub-01" / "ASL4D.json"
+        self.src.write_text("contents")
+        self.merge_root = Path(self.tmpdir.name) / "merged"
+        (self.merge_root / "sub-01").mkdir(parents=True)
+        # A destination left over from a previous symbolic merge, pointing back at the source
+        self.dst = self.merge_root / "sub-01" / "ASL4D.json"
+        os.symlink(self.src, self.dst)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_symlinked_destination_is_skipped_without_overwrite(self):
+        merge_directories([self.study], self.merge_root, symbolic=False, overwrite=False)
+        self.assertEqual(self.src.read_text(), "contents")
+        self.assertTrue(self.dst.is_symlink())
+
+    def test_symlinked_destination_is_replaced_with_overwrite(self):
+        merge_directories([self.study], self.merge_root, symbolic=False, overwrite=True)
+        self.assertEqual(self.src.read_text(), "contents")
+        self.assertFalse(self.dst.is_symlink())
+        self.assertEqual(self.dst.read_text(), "contents")
+
+
+if __name__ == '__main__':
+    unittest.main()